@@ -1,17 +1,22 @@
 """Main module"""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import difflib
+from errno import EBADF, ELOOP, ENOENT, ENOTDIR
+from functools import lru_cache
+from itertools import islice
+import os
 from pathlib import Path
 import re
+from stat import S_ISREG
+import sys
 import traceback
 from typing import TYPE_CHECKING, Any, ClassVar, Iterator, Literal, cast
 
-from ruamel.yaml import YAML, MappingNode, Node
-
 if TYPE_CHECKING:
     from _pytest.python import Metafunc
+    from ruamel.yaml import YAML, Node
 
 
 def pytest_addoption(parser):
@@ -37,15 +42,21 @@ def pytest_configure(config):
 
 def pytest_generate_tests(metafunc: Metafunc) -> None:
     """Generate tests for a pytest param_file decorator."""
+    param_files_regen = metafunc.config.getoption("param_files_regen")
     for marker in metafunc.definition.iter_markers(name="param_file"):
-        param_files_regen = metafunc.config.getoption("param_files_regen")
         fixture_name, file_params, ids = create_parameters(
             *marker.args, **marker.kwargs, regen_on_failure=param_files_regen
         )
         metafunc.parametrize(argnames=fixture_name, argvalues=file_params, ids=ids)
 
 
-@dataclass
+# slots reduce the memory of each instance, but are only supported from Python 3.10
+_DATACLASS_OPTIONS: dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ParamTestData:
     """Data class for a single test."""
 
@@ -80,14 +91,24 @@ class ParamTestData:
             # TODO how to cache regeneration until all test parameters are run?
             try:
                 self.fmt.regen_file(self, actual, **kwargs)
-            except Exception:
-                error += f"\nRegeneration failed:\n{traceback.format_exc()}"
+            except Exception as exc:
+                # formatting the full traceback is slow, so is only done on request
+                if os.environ.get("PARAM_FILES_TB"):
+                    error += f"\nRegeneration failed:\n{traceback.format_exc()}"
+                else:
+                    error += f"\nRegeneration failed: {exc!r}"
 
             else:
                 error += f"\nREGENERATED FILE: {self.fmt.path}"
         raise AssertionError(error)
 
 
+# errors when checking a fixture file, that mean it is missing
+# (the same as those ignored by `Path.is_file`)
+_MISSING_ERRNOS = (ENOENT, ENOTDIR, EBADF, ELOOP)
+_MISSING_WINERRORS = (21, 123, 1921)  # not ready, invalid name, cannot resolve
+
+
 def create_parameters(
     path: str | Path,
     fmt: Literal["dot", "yaml"] = "dot",
@@ -106,9 +127,62 @@ def create_parameters(
     """
     path = Path(path)
     # check if the file exists
-    if not path.is_file():
+    # (the stat is also used to invalidate the read cache, if the file changes)
+    try:
+        stat = path.stat()
+    except ValueError:
+        # e.g. an embedded null byte
+        stat = None
+    except OSError as exc:
+        # other errors, such as permission errors, are propagated as-is
+        if (
+            exc.errno not in _MISSING_ERRNOS
+            and getattr(exc, "winerror", None) not in _MISSING_WINERRORS
+        ):
+            raise
+        stat = None
+    if stat is None or not S_ISREG(stat.st_mode):
         raise FileNotFoundError(f"File {path} not found.")
 
+    # read fixture file
+    cached_params, ids = _read_file(
+        path,
+        path.resolve(),
+        stat.st_mtime_ns,
+        stat.st_size,
+        fmt,
+        encoding,
+        regen_on_failure,
+    )
+
+    # copy the cached test data, so that it is not shared between markers
+    # (note this is a shallow copy, nested content/expected values are still shared)
+    file_params = [replace(param, extra=dict(param.extra)) for param in cached_params]
+
+    return fixture_name, file_params, list(ids)
+
+
+@lru_cache(maxsize=128)
+def _read_file(
+    path: Path,
+    resolved_path: Path,
+    mtime_ns: int,
+    size: int,
+    fmt: str,
+    encoding: str,
+    regen_on_failure: bool,
+) -> tuple[tuple[ParamTestData, ...], tuple[str, ...]]:
+    """Read a fixture file, caching the result for markers that share the file.
+
+    :param path: Path to the fixture file, as given (and shown in messages).
+    :param resolved_path: Resolved path to the fixture file
+        (only used in the cache key, so that a relative path is not shared
+        between working directories).
+    :param mtime_ns: Modification time of the fixture file (for cache invalidation).
+    :param size: Size of the fixture file (for cache invalidation).
+
+    :return: A tuple of test data and a tuple of pytest parametrize ids.
+    """
     # select read format
     if fmt == "dot":
         fmt_inst = DotFormat(path, encoding, regen_on_failure)
@@ -117,16 +191,33 @@ def create_parameters(
     else:
         raise NotImplementedError(f"Unknown format {fmt!r}, set to 'dot' or 'yaml'")
 
-    # read fixture file
-    file_params = list(fmt_inst.read())
+    # collect test data and create pytest parametrize ids, in a single pass
+    file_params: list[ParamTestData] = []
+    ids: list[str] = []
+    for param in fmt_inst.read():
+        file_params.append(param)
+        ids.append(f"{param.line}-{param.title}")
+
+    return tuple(file_params), tuple(ids)
+
 
-    # create pytest parametrize ids
-    ids = [f"{p.line}-{p.title}" for p in file_params]
+# line boundaries (as for `str.splitlines`) other than "\n"
+_LINE_BREAK_RE = re.compile(r"\r\n?|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+# whitespace at the end of each line, and at the end of the string
+_TRAILING_WS_RE = re.compile(r"[^\S\n]+(?=\n)|\s+\Z")
 
-    return fixture_name, file_params, ids
+
+def _rstrip_lines(text: str) -> str:
+    """Apply `str.rstrip` to each line of the text, and to the text as a whole.
+
+    Lines are split on the same boundaries as `str.splitlines`, and joined with "\n".
+    """
+    return _TRAILING_WS_RE.sub("", _LINE_BREAK_RE.sub("\n", text))
 
 
-_TITLE_RE = re.compile(r"^\s*\[(?P<title>\S+)\]\s*(?P<description>.*)$")
+# a separator line, matched from the newline before it (so the text must be
+# prefixed with a newline), which lets the search skip straight to each "\n."
+_DOT_LINE_RE = re.compile(r"\n\.[^\S\n]*(?=\n|\Z)")
 
 
 class FormatAbstract:
@@ -171,35 +262,52 @@ class DotFormat(FormatAbstract):
     name: ClassVar[str] = "dot"
 
     def read(self) -> Iterator[ParamTestData]:
-        text = self.path.read_text(encoding=self.encoding)
-        tests = []
-        section = 0
-        last_pos = 0
-        lines = text.splitlines(keepends=True)
-        for i in range(len(lines)):
-            if lines[i].rstrip() == ".":
-                if section == 0:
-                    first_line = lines[i - 1].strip()
-                    match = _TITLE_RE.match(first_line)
-                    if match:
-                        title = match.group("title")
-                        description = match.group("description")
-                    else:
-                        title = first_line
-                        description = None
-                    tests.append([i, title, description])
-                    section = 1
-                elif section == 1:
-                    tests[-1].append("".join(lines[last_pos + 1 : i]))
-                    section = 2
-                elif section == 2:
-                    tests[-1].append("".join(lines[last_pos + 1 : i]))
-                    section = 0
-
-                last_pos = i
-
-        for index, test in enumerate(tests):
-            yield ParamTestData(*test, fmt=self, index=index)
+        # decoding the bytes directly is faster than reading in text mode,
+        # but universal newlines then need to be applied manually
+        text = self.path.read_bytes().decode(self.encoding)
+        if "." not in text:
+            # empty file, or no separator lines, so there are no tests
+            return
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        text = "\n" + text
+        # the other `str.splitlines` boundaries are kept in the content,
+        # but also end lines, so separators and line numbers are found on a copy
+        # with them replaced by "\n" (which keeps the same offsets)
+        lines = _LINE_BREAK_RE.sub("\n", text)
+        # separators cycle through: after title, after content, after expected
+        separators = _DOT_LINE_RE.finditer(lines)
+        line = counted = 0
+        for index, title_sep in enumerate(separators):
+            start = title_sep.start()
+            line += lines.count("\n", counted, start)
+            counted = start
+            content_sep = next(separators, None)
+            expected_sep = next(separators, None)
+            if content_sep is None or expected_sep is None:
+                raise ValueError(f"Incomplete test at line {line} of {self.path}")
+            # the title is the line before the first separator,
+            # either "[title] description" or just "title"
+            first_line = lines[lines.rfind("\n", 0, start) + 1 : start].strip()
+            end = -1
+            if first_line.startswith("[") and first_line[1:2].strip():
+                # the title runs up to the last "]" before any whitespace
+                end = first_line[1:].split(None, 1)[0].rfind("]")
+            if end > 0:
+                title = first_line[1 : end + 1]
+                description = first_line[end + 2 :].lstrip()
+            else:
+                title = first_line
+                description = None
+            yield ParamTestData(
+                line,
+                title,
+                description,
+                text[title_sep.end() + 1 : content_sep.start() + 1],
+                text[content_sep.end() + 1 : expected_sep.start() + 1],
+                fmt=self,
+                index=index,
+            )
 
     def assert_expected(
         self,
@@ -227,32 +335,55 @@ class DotFormat(FormatAbstract):
         rstrip: bool = False,
         rstrip_lines: bool = False,
     ) -> None:
+        """Regenerate the expected section of a test in the fixture file.
+
+        The rest of the file is kept byte-for-byte, and the regenerated section uses
+        the newline style ("\\n", "\\r\\n" or "\\r") of the separator line before it.
+        """
         if rstrip:
             actual = actual.rstrip()
         if rstrip_lines:
-            actual = "\n".join(line.rstrip() for line in actual.splitlines()).rstrip()
-        text = []
-        for index, current in enumerate(self.read()):
-            if current.description is not None:
-                text.append(f"[{current.title}] {current.description}\n")
-            else:
-                text.append(f"{current.title}\n")
-            text.append(".\n")
-            text.append(current.content)
-            text.append(".\n")
-            if index == data.index:
-                # TODO what if actual has '.' line in the middle?
-                expected = actual
-            else:
-                expected = current.expected
-            text.append(expected)
-            if not expected.endswith("\n"):
-                text.append("\n")
-            text.append(".\n")
-            text.append("\n")
-        if text:
-            text = text[:-1]
-        self.path.write_text("".join(text), encoding=self.encoding)
+            actual = _rstrip_lines(actual)
+        # TODO what if actual has '.' line in the middle?
+        text = self.path.read_bytes().decode(self.encoding)
+        # separators are found on lines split as for `read`,
+        # then the lines between them are replaced in the original text
+        lines = "\n" + _LINE_BREAK_RE.sub("\n", text)
+        # only replace the expected section, between the 2nd and 3rd separators
+        separators = list(
+            islice(_DOT_LINE_RE.finditer(lines), 3 * data.index + 1, 3 * data.index + 3)
+        )
+        if len(separators) != 2:
+            raise ValueError(f"Test at index {data.index} not found in {self.path}")
+        start, end = (lines.count("\n", 0, sep.start()) for sep in separators)
+        text_lines = text.splitlines(keepends=True)
+        # use the newline of the separator line before the section
+        # (which also ensures its "\r" is not joined to a "\n" in the section)
+        sep_line = text_lines[start]
+        newline = "\n"
+        if sep_line.endswith("\r\n"):
+            newline = "\r\n"
+        elif sep_line.endswith("\r"):
+            newline = "\r"
+        if "\r" in actual:
+            actual = actual.replace("\r\n", "\n").replace("\r", "\n")
+        if not actual.endswith("\n"):
+            actual += "\n"
+        if newline != "\n":
+            actual = actual.replace("\n", newline)
+        new_text = "".join((*text_lines[: start + 1], actual, *text_lines[end:]))
+        self.path.write_bytes(new_text.encode(self.encoding))
+
+
+@lru_cache(maxsize=None)
+def _get_yaml(typ: str) -> YAML:
+    """Return a YAML instance, created on first use and shared across fixture files.
+
+    (note these are not thread-safe, but pytest collection is single-threaded)
+    """
+    from ruamel.yaml import YAML
+
+    return YAML(typ=typ)
 
 
 class YamlFormat(FormatAbstract):
@@ -266,34 +397,46 @@ class YamlFormat(FormatAbstract):
         :return: List of test data.
         """
         text = self.path.read_text(encoding=self.encoding)
-        yaml = YAML(typ="safe")
-        node = yaml.compose(text)
-        if not isinstance(node, MappingNode):
+        safe_yaml = _get_yaml("safe")
+        node = safe_yaml.compose(text)
+        # check the node id rather than its class, since the cached YAML instance
+        # may come from a different import of ruamel.yaml (e.g. under pytester)
+        if getattr(node, "id", None) != "mapping":
             raise TypeError(f"Expected sequence, got {type(node)}")
-        data: dict = YAML(typ="safe").load(text)
-        assert len(node.value) == len(data), "YAML node count mismatch"
+        # construct values directly from the composed nodes,
+        # so the text is only parsed once
+        constructor = safe_yaml.constructor
         title_node: Node
-        for index, ((title_node, _), (title, item)) in enumerate(
-            zip(node.value, data.items())
-        ):
-            line = title_node.start_mark.line + 1
-            if not isinstance(item, dict):
-                raise TypeError(
-                    f"Expected mapping value at line {line}, got {type(item)}"
+        value_node: Node
+        titles = set()
+        try:
+            for index, (title_node, value_node) in enumerate(node.value):
+                line = title_node.start_mark.line + 1
+                title = constructor.construct_object(title_node)
+                if title in titles:
+                    raise KeyError(f"Duplicate title {title!r} at line {line}")
+                titles.add(title)
+                item = constructor.construct_object(value_node, deep=True)
+                if not isinstance(item, dict):
+                    raise TypeError(
+                        f"Expected mapping value at line {line}, got {type(item)}"
+                    )
+                for key in ("content", "expected"):
+                    if key not in item:
+                        raise KeyError(f"Missing '{key}' key for item at line {line}")
+                yield ParamTestData(
+                    line,
+                    title,
+                    item.get("description"),
+                    item["content"],
+                    item["expected"],
+                    fmt=self,
+                    index=index,
+                    extra=item,
                 )
-            for key in ("content", "expected"):
-                if key not in item:
-                    raise KeyError(f"Missing '{key}' key for item at line {line}")
-            yield ParamTestData(
-                line,
-                title,
-                item.get("description"),
-                item["content"],
-                item["expected"],
-                fmt=self,
-                index=index,
-                extra=item,
-            )
+        finally:
+            constructor.constructed_objects.clear()
+            constructor.recursive_objects.clear()
 
     def assert_expected(
         self,
@@ -329,10 +472,11 @@ class YamlFormat(FormatAbstract):
 
     def regen_file(self, data: ParamTestData, actual: Any, **kwargs: Any) -> None:
         """Regenerate the fixture file."""
-        new = YAML(typ="rt").load(self.path.read_text(encoding=self.encoding))
+        rt_yaml = _get_yaml("rt")
+        new = rt_yaml.load(self.path.read_text(encoding=self.encoding))
         new[data.title]["expected"] = actual
         with self.path.open("w", encoding=self.encoding) as handle:
-            YAML(typ="rt").dump(new, handle)
+            rt_yaml.dump(new, handle)
 
 
 def assert_expected_strings(
@@ -355,30 +499,59 @@ def assert_expected_strings(
         actual = actual.rstrip()
         expected = expected.rstrip()
     if rstrip_lines:
-        actual = "\n".join(line.rstrip() for line in actual.splitlines()).rstrip()
-        expected = "\n".join(line.rstrip() for line in expected.splitlines()).rstrip()
+        actual = _rstrip_lines(actual)
+        expected = _rstrip_lines(expected)
 
     if actual == expected:
         return None
     return diff_strings(actual, expected, path, line)
 
 
+# common lines kept either side of the differing lines, when trimming the diff input
+# (well beyond the diff context, so that difflib still has the same anchoring;
+# but for inputs of 200+ lines, difflib's "autojunk" threshold for popular lines
+# depends on their length, so repetitive inputs may still align differently,
+# although the diff is equally valid)
+_DIFF_TRIM_MARGIN = 100
+_DIFF_MAX_LINES = 500
+_HUNK_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$")
+
+
+def _shift_hunk(match: re.Match, offset: int) -> str:
+    """Return a unified diff hunk header, with its line numbers shifted by offset."""
+    from_len, to_len = match.group(2) or "", match.group(4) or ""
+    from_start, to_start = int(match.group(1)) + offset, int(match.group(3)) + offset
+    return f"@@ -{from_start}{from_len} +{to_start}{to_len} @@"
+
+
 def diff_strings(actual: str, expected: str, path: Path, line: int) -> str:
     """Return a diff string between actual and expected."""
-    diff_lines = list(
-        difflib.unified_diff(
-            (expected + "\n").splitlines(keepends=True),
-            (actual + "\n").splitlines(keepends=True),
-            fromfile=f"{path}:{line}",
-            tofile="(actual)",
-            lineterm="\n",
-        )
-    )
-    if len(diff_lines) <= 500:
-        return "actual != expected (use --regen-file-failure)\n" + "".join(diff_lines)
-    else:
-        return (
-            "actual != expected (use --regen-file-failure)\n"
-            f"diff too big to show ({len(diff_lines)}): "
-            f"{path}:{line}"
-        )
+    expected_lines = (expected + "\n").splitlines(keepends=True)
+    actual_lines = (actual + "\n").splitlines(keepends=True)
+    # for long inputs, only diff the lines between the common leading/trailing lines
+    # (plus a margin), since the cost of the diff grows with the length of the inputs
+    prefix = len(os.path.commonprefix([expected_lines, actual_lines]))
+    expected_rest, actual_rest = expected_lines[prefix:], actual_lines[prefix:]
+    suffix = len(os.path.commonprefix([expected_rest[::-1], actual_rest[::-1]]))
+    start = max(prefix - _DIFF_TRIM_MARGIN, 0)
+    end = max(suffix - _DIFF_TRIM_MARGIN, 0)
+    diff_lines: list[str] = []
+    for diff_line in difflib.unified_diff(
+        expected_lines[start : len(expected_lines) - end],
+        actual_lines[start : len(actual_lines) - end],
+        fromfile=f"{path}:{line}",
+        tofile="(actual)",
+        lineterm="\n",
+    ):
+        # stop formatting as soon as the diff is known to be too big to show
+        if len(diff_lines) >= _DIFF_MAX_LINES:
+            return (
+                "actual != expected (use --regen-file-failure)\n"
+                f"diff too big to show (>{_DIFF_MAX_LINES} lines): "
+                f"{path}:{line}"
+            )
+        if start and diff_line.startswith("@@"):
+            # shift the hunk line numbers back to those of the untrimmed strings
+            diff_line = _HUNK_RE.sub(lambda m: _shift_hunk(m, start), diff_line)
+        diff_lines.append(diff_line)
+    return "actual != expected (use --regen-file-failure)\n" + "".join(diff_lines)
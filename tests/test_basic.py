@@ -1,7 +1,10 @@
 from pathlib import Path
+import re
 
 import pytest
 
+from pytest_param_files.main import create_parameters
+
 
 @pytest.mark.param_file(Path(__file__).parent / "fixtures" / "basic.txt", fmt="dot")
 def test_basic_dot(file_params):
@@ -35,3 +38,32 @@ def test_basic_yaml(file_params):
     file_params.assert_expected("Other", rstrip=True)
     with pytest.raises(AssertionError, match="basic.yaml"):
         file_params.assert_expected("Otherx", rstrip=True)
+
+
+@pytest.mark.parametrize(
+    "name", ["missing.txt", "folder", "file.txt/missing.txt", "loop.txt", "null\0.txt"]
+)
+def test_missing_file(tmp_path: Path, name: str):
+    """Paths that are not existing files should raise a `FileNotFoundError`."""
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "file.txt").touch()
+    (tmp_path / "loop.txt").symlink_to(tmp_path / "loop.txt")
+    with pytest.raises(FileNotFoundError, match="not found"):
+        create_parameters(tmp_path / name)
+
+
+def test_stat_error(tmp_path: Path):
+    """Other errors, when checking the file, should be propagated as-is."""
+    with pytest.raises(OSError) as exc_info:
+        create_parameters(tmp_path / ("x" * 1000))
+    assert not isinstance(exc_info.value, FileNotFoundError)
+
+
+def test_path_as_given(tmp_path: Path):
+    """Messages should show the path as given, not the resolved path."""
+    path = tmp_path / "link.txt"
+    path.symlink_to(Path(__file__).parent / "fixtures" / "basic.txt")
+    _, params, _ = create_parameters(path)
+    assert params[0].fmt.path == path
+    with pytest.raises(AssertionError, match=re.escape(f"--- {path}:")):
+        params[0].assert_expected("Otherx")
@@ -0,0 +1,138 @@
+"""Tests for the fixture file formats."""
+import difflib
+from pathlib import Path
+
+import pytest
+
+from pytest_param_files.main import (
+    DotFormat,
+    YamlFormat,
+    _get_yaml,
+    assert_expected_strings,
+    diff_strings,
+)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[name] description\n.\ncontent\n.\nexpected\n.\n",
+        # trailing whitespace after separators
+        "[name] description\n. \ncontent\n.\t\nexpected\n.  \n",
+        # no newline after the final separator
+        "[name] description\n.\ncontent\n.\nexpected\n.",
+        "[name] description\r\n.\r\ncontent\r\n.\r\nexpected\r\n.\r\n",
+        "[name] description\r.\rcontent\r.\rexpected\r.\r",
+    ],
+    ids=["basic", "trailing-ws", "no-final-newline", "crlf", "cr"],
+)
+def test_dot_read(tmp_path: Path, text: str):
+    """Separator lines and newline styles should all parse the same."""
+    path = tmp_path / "fixture.txt"
+    path.write_bytes(text.encode("utf8"))
+    assert [
+        (p.line, p.title, p.description, p.content, p.expected)
+        for p in DotFormat(path).read()
+    ] == [(1, "name", "description", "content\n", "expected\n")]
+
+
+@pytest.mark.parametrize("char", ["\x0b", "\x0c", "\x1c", "\x85", "\u2028"])
+def test_dot_read_line_boundaries(tmp_path: Path, char: str):
+    """Other `str.splitlines` boundaries should end lines, but be kept in the content."""
+    path = tmp_path / "fixture.txt"
+    path.write_text(
+        f"[a]\n.\nx{char}y\n.\nz\n.\n\n[b]\n.\nx{char}.\nz\n.\n", newline=""
+    )
+    assert [
+        (p.line, p.title, p.content, p.expected) for p in DotFormat(path).read()
+    ] == [
+        (1, "a", f"x{char}y\n", "z\n"),
+        (9, "b", f"x{char}", "z\n"),
+    ]
+
+
+def test_dot_read_no_title(tmp_path: Path):
+    """A file starting with a separator should give a test with an empty title."""
+    path = tmp_path / "fixture.txt"
+    path.write_text(".\ncontent\n.\nexpected\n.\n")
+    assert [
+        (p.line, p.title, p.content, p.expected) for p in DotFormat(path).read()
+    ] == [(0, "", "content\n", "expected\n")]
+
+
+def test_dot_read_incomplete(tmp_path: Path):
+    """A final test without all its separators should raise an error."""
+    path = tmp_path / "fixture.txt"
+    path.write_text("name1\n.\na\n.\nb\n.\n\nname2\n.\nc\n.\nd\n")
+    with pytest.raises(ValueError, match="Incomplete test at line 8"):
+        list(DotFormat(path).read())
+
+
+def test_yaml_duplicate_title(tmp_path: Path):
+    """Duplicate titles should raise an error."""
+    path = tmp_path / "fixture.yaml"
+    path.write_text(
+        "name1:\n  content: a\n  expected: b\nname1:\n  content: c\n  expected: d\n"
+    )
+    with pytest.raises(KeyError, match="Duplicate title 'name1' at line 4"):
+        list(YamlFormat(path).read())
+
+
+def test_yaml_anchors_read_twice(tmp_path: Path):
+    """Anchors and aliases should resolve the same on every read."""
+    path = tmp_path / "fixture.yaml"
+    path.write_text(
+        "name1:\n"
+        "  content: &content [a, b]\n"
+        "  expected: &expected {x: 1}\n"
+        "name2:\n"
+        "  content: *content\n"
+        "  expected: *expected\n"
+        "name3: &item\n"
+        "  content: c\n"
+        "  expected: d\n"
+        "name4: *item\n"
+    )
+    fmt = YamlFormat(path)
+    first = [(p.title, p.content, p.expected) for p in fmt.read()]
+    second = [(p.title, p.content, p.expected) for p in fmt.read()]
+    assert (
+        first
+        == second
+        == [
+            ("name1", ["a", "b"], {"x": 1}),
+            ("name2", ["a", "b"], {"x": 1}),
+            ("name3", "c", "d"),
+            ("name4", "c", "d"),
+        ]
+    )
+    # the shared constructor should not keep objects from previous reads
+    constructor = _get_yaml("safe").constructor
+    assert not constructor.constructed_objects
+    assert not constructor.recursive_objects
+
+
+def test_diff_long_strings():
+    """Trimming long inputs should not change the hunk line numbers of the diff."""
+    expected = "".join(f"line {i}\n" for i in range(1000))
+    actual = expected.replace("line 500\n", "other 500\n").replace(
+        "line 700\n", "line 700\nextra\n"
+    )
+    diff = diff_strings(actual, expected, Path("file.txt"), 1)
+    untrimmed = difflib.unified_diff(
+        (expected + "\n").splitlines(keepends=True),
+        (actual + "\n").splitlines(keepends=True),
+    )
+    hunks = [line for line in untrimmed if line.startswith("@@")]
+    assert hunks == ["@@ -498,7 +498,7 @@\n", "@@ -699,6 +699,7 @@\n"]
+    assert [
+        line for line in diff.splitlines(keepends=True) if line[:2] == "@@"
+    ] == hunks
+
+
+@pytest.mark.parametrize(
+    "actual", ["a\nb", "a \r\nb\t", "a\rb\n\n", "a\x0cb", "a\u2028b ", "a  \x85b"]
+)
+def test_rstrip_lines(actual: str):
+    """Lines should be split on the same boundaries as `str.splitlines`."""
+    assert assert_expected_strings(actual, "a\nb", Path(), 1, rstrip_lines=True) is None
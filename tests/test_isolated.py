@@ -57,3 +57,153 @@ def test_regen(pytester: "Pytester", fmt: str, fname: str):
     assert "REGENERATED FILE" in result.stdout.str()
     result = pytester.runpytest()
     result.assert_outcomes(passed=2)
+
+
+def test_reparse_rewritten_file(pytester: "Pytester"):
+    """A fixture file rewritten in the same process should be re-parsed."""
+    pytester.copy_example(Path("tests", "fixtures", "basic.txt"))
+    pytester.makepyfile(
+        """
+        from pathlib import Path
+        import pytest
+        @pytest.mark.param_file(Path(__file__).parent / "basic.txt", fmt="dot")
+        def test_basic(file_params):
+            file_params.assert_expected("Other", rstrip=True)
+    """
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=2)
+    path = pytester.path / "basic.txt"
+    path.write_text(
+        path.read_text() + "\n[name3] description\n.\nSomething\n.\nNew\n.\n"
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=2, failed=1)
+
+
+def test_shared_file(pytester: "Pytester"):
+    """Multiple markers should be able to use the same fixture file."""
+    pytester.copy_example(Path("tests", "fixtures", "basic.yaml"))
+    pytester.makepyfile(
+        """
+        from pathlib import Path
+        import pytest
+        PATH = Path(__file__).parent / "basic.yaml"
+        @pytest.mark.param_file(PATH, fmt="yaml")
+        def test_first(file_params):
+            assert file_params.title.startswith("name")
+            file_params.extra["mutated"] = True
+        @pytest.mark.param_file(PATH, fmt="yaml")
+        def test_second(file_params):
+            assert file_params.title.startswith("name")
+            assert "mutated" not in file_params.extra
+    """
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=4)
+
+
+def test_regen_dot_splice(pytester: "Pytester"):
+    """Re-genning a dot test should only change its expected section."""
+    before = (
+        "# a comment\n"
+        "[name1] description\n.\nSomething\n.\nOther\n.\n\n\n"
+        "# another comment\n"
+        "[name2] description\n.\nSomething\n.\nOther\n.\n\n"
+        "[name3]\n.\nSomething\n.\nOther\n."
+    )
+    pytester.makefile(".txt", fixture=before)
+    pytester.makepyfile(
+        """
+        from pathlib import Path
+        import pytest
+        @pytest.mark.param_file(Path(__file__).parent / "fixture.txt", fmt="dot")
+        def test_splice(file_params):
+            if file_params.title == "name1":
+                file_params.assert_expected("Other", rstrip=True)
+            else:
+                file_params.assert_expected("New\\nlines", rstrip=True)
+    """
+    )
+    result = pytester.runpytest("--regen-file-failure")
+    result.assert_outcomes(passed=1, failed=2)
+    assert (pytester.path / "fixture.txt").read_text() == (
+        "# a comment\n"
+        "[name1] description\n.\nSomething\n.\nOther\n.\n\n\n"
+        "# another comment\n"
+        "[name2] description\n.\nSomething\n.\nNew\nlines\n.\n\n"
+        "[name3]\n.\nSomething\n.\nNew\nlines\n."
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=3)
+
+
+def test_regen_dot_missing_test(pytester: "Pytester"):
+    """Re-genning a test no longer in the file should report the error."""
+    pytester.copy_example(Path("tests", "fixtures", "basic.txt"))
+    pytester.makepyfile(
+        """
+        from pathlib import Path
+        import pytest
+        PATH = Path(__file__).parent / "basic.txt"
+        @pytest.mark.param_file(PATH, fmt="dot")
+        def test_missing(file_params):
+            PATH.write_text("")
+            file_params.assert_expected("Wrong")
+    """
+    )
+    result = pytester.runpytest("--regen-file-failure")
+    result.assert_outcomes(failed=2)
+    result.stdout.fnmatch_lines(
+        ["*Regeneration failed: ValueError('Test at index 0 not found in *"]
+    )
+
+
+DOT_NEWLINES = (
+    "[name1]\n.\nSomething\n.\nOther\n.\n\n[name2]\n.\nSomething\n.\nOther\n.\n"
+)
+DOT_NEWLINES_REGEN = (
+    "[name1]\n.\nSomething\n.\nNew\nlines\n.\n\n"
+    "[name2]\n.\nSomething\n.\nNew\nlines\n.\n"
+)
+
+
+@pytest.mark.parametrize(
+    "before,after",
+    [
+        (DOT_NEWLINES, DOT_NEWLINES_REGEN),
+        (DOT_NEWLINES.replace("\n", "\r\n"), DOT_NEWLINES_REGEN.replace("\n", "\r\n")),
+        (DOT_NEWLINES.replace("\n", "\r"), DOT_NEWLINES_REGEN.replace("\n", "\r")),
+        (
+            "[name1]\n.\nSome\rthing\n.\nOther\n.\n\n"
+            "[name2]\r\n.\r\nSomething\r\n.\r\nOther\r\n.\r\n",
+            "[name1]\n.\nSome\rthing\n.\nNew\nlines\n.\n\n"
+            "[name2]\r\n.\r\nSomething\r\n.\r\nNew\r\nlines\r\n.\r\n",
+        ),
+        (
+            "[name1]\n.\nSomething\n.\rOther\n.\n\n"
+            "[name2]\n.\nSome\r\nthing\n.\nOther\n.",
+            "[name1]\n.\nSomething\n.\rNew\rlines\r.\n\n"
+            "[name2]\n.\nSome\r\nthing\n.\nNew\nlines\n.",
+        ),
+    ],
+    ids=["lf", "crlf", "cr", "mixed-tests", "mixed-lines"],
+)
+def test_regen_dot_newlines(pytester: "Pytester", before: str, after: str):
+    """Re-genning a dot test should keep the newline style of the file."""
+    path = pytester.path / "fixture.txt"
+    path.write_bytes(before.encode("utf8"))
+    pytester.makepyfile(
+        """
+        from pathlib import Path
+        import pytest
+        @pytest.mark.param_file(Path(__file__).parent / "fixture.txt", fmt="dot")
+        def test_newlines(file_params):
+            file_params.assert_expected("New\\nlines\\n")
+    """
+    )
+    result = pytester.runpytest("--regen-file-failure")
+    result.assert_outcomes(failed=2)
+    assert path.read_bytes().decode("utf8") == after
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=2)